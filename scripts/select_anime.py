@@ -10,26 +10,268 @@ import os
 import sys
 import json
 import re
+import sqlite3
+import hashlib
 import argparse
-from typing import Dict, List, Any, Optional, Tuple
+from collections import namedtuple
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple
 
-try:
+if TYPE_CHECKING:
     import anthropic
+
+
+# MAL metadata for one anime; episodes, year and anime_type may be None
+MalInfo = namedtuple("MalInfo", "title episodes year anime_type")
+
+
+# Use orjson for parsing/serialization when available; fall back to json
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumpb = orjson.dumps
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
 except ImportError:
-    print(json.dumps({
-        "error": "anthropic package not installed. Run: pip install anthropic",
-        "index": 0,
-        "confidence": "error"
-    }))
-    sys.exit(1)
+    _loads = json.loads
+
+    def _dumpb(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+
+def _write_json(obj: Any) -> None:
+    """Write obj as one line of UTF-8 JSON straight to the stdout buffer."""
+    out = sys.stdout.buffer
+    out.write(_dumpb(obj))
+    out.write(b"\n")
+    out.flush()
+
+
+# Matches the "(64 eps)" suffix that get_anime_candidates.sh appends
+_EPS_RE = re.compile(r'\((\d+)\s+eps?\)', re.IGNORECASE)
+
+
+# Anthropic clients keyed by API key, so repeated calls in one process reuse
+# the same HTTP connection pool instead of re-doing the TCP/TLS handshake
+_CLIENT_CACHE: Dict[str, "anthropic.Anthropic"] = {}
+
+
+def _get_client(api_key: str) -> "anthropic.Anthropic":
+    """
+    Return a cached Anthropic client for the given API key.
+
+    anthropic (and httpx) are imported here rather than at module level, so
+    selections resolved without the API never pay their import cost.
+    """
+    client = _CLIENT_CACHE.get(api_key)
+    if client is None:
+        import anthropic
+        import httpx
+
+        client = anthropic.Anthropic(
+            api_key=api_key,
+            max_retries=2,
+            http_client=httpx.Client(
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+            ),
+        )
+        _CLIENT_CACHE[api_key] = client
+    return client
+
+
+# Optional on-disk cache of selections, enabled with SELECT_ANIME_CACHE=1.
+# Selections are deterministic (temperature=0.0), so re-runs over the same
+# library can skip the API call entirely.
+_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "select_anime", "cache.db")
+
+_SELECTION_MODEL = "claude-3-5-haiku-20241022"
+# Part of every cache key; bump when the prompt or generation settings change
+# so selections made under the old ones are no longer served
+_PROMPT_VERSION = 2
+
+
+def _cache_enabled() -> bool:
+    return os.getenv("SELECT_ANIME_CACHE") == "1"
+
+
+def _cache_key(mal_info: MalInfo, candidates: List[str]) -> str:
+    payload = json.dumps(
+        [_SELECTION_MODEL, _PROMPT_VERSION, mal_info._asdict(), candidates],
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(_CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS selections (key TEXT PRIMARY KEY, result TEXT NOT NULL)"
+    )
+    return conn
+
+
+def _cache_get(key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached selection for key, or None on miss or cache failure."""
+    try:
+        conn = _cache_connect()
+        try:
+            row = conn.execute(
+                "SELECT result FROM selections WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return _loads(row[0]) if row else None
+    except (sqlite3.Error, OSError, ValueError):
+        return None
+
+
+def _cache_put(key: str, result: Dict[str, Any]) -> None:
+    """Store a selection; cache failures never affect the selection itself."""
+    try:
+        conn = _cache_connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO selections (key, result) VALUES (?, ?)",
+                    (key, _dumps(result)),
+                )
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError):
+        pass
 
 
 def parse_episode_count(title: str) -> Optional[int]:
     """Extract episode count from anime title string like 'Title (64 eps)'"""
-    match = re.search(r'\((\d+)\s+eps?\)', title, re.IGNORECASE)
-    if match:
-        return int(match.group(1))
-    return None
+    match = _EPS_RE.search(title)
+    return int(match.group(1)) if match else None
+
+
+# First JSON object in a reply (allowing one level of nesting), whether it is
+# bare, inside a markdown fence, or embedded in prose
+_JSON_EXTRACT_RE = re.compile(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', re.DOTALL)
+# First JSON array of flat objects in a reply, for batch selections
+_JSON_ARRAY_EXTRACT_RE = re.compile(r'\[\s*\{[^{}]*\}(?:\s*,\s*\{[^{}]*\})*\s*\]', re.DOTALL)
+
+# Title words marking extra content rather than the main series. Movies and
+# PVs only count as extras when the MAL entry is a TV series.
+_SPECIAL_KEYWORDS = frozenset({"special", "specials", "recap", "ova", "ona"})
+_TV_SPECIAL_KEYWORDS = _SPECIAL_KEYWORDS | {"pv", "movie"}
+# Punctuation treated as word separators when tokenizing titles
+_SPLIT_TRANS = str.maketrans("()[]{}.,:;!?-/", " " * 14)
+
+
+def _looks_like_extra(title: str, anime_type: Optional[str]) -> bool:
+    """
+    Return True if the title contains a specials/OVA/recap/ONA keyword, or
+    for TV anime also a movie/PV keyword.
+    """
+    keywords = _TV_SPECIAL_KEYWORDS if anime_type == 'TV' else _SPECIAL_KEYWORDS
+    return not keywords.isdisjoint(title.lower().translate(_SPLIT_TRANS).split())
+
+
+def _main_series_candidates(mal_info: MalInfo, candidates: List[str]) -> List[int]:
+    """
+    Return the indices of candidates worth showing to Claude.
+
+    For TV anime, candidates that look like extra content are dropped unless
+    that would leave nothing to choose from.
+    """
+    indices = list(range(len(candidates)))
+    if len(candidates) > 1 and mal_info.anime_type == 'TV':
+        filtered = [i for i in indices if not _looks_like_extra(candidates[i], 'TV')]
+        if filtered:
+            return filtered
+    return indices
+
+
+def _try_local_match(mal_info: MalInfo, candidates: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Pick a candidate without calling Claude when the answer is obvious.
+
+    Returns a selection result if exactly one non-extra candidate has the
+    same episode count as MAL, otherwise None.
+    """
+    mal_episodes = mal_info.episodes
+    if mal_episodes is None:
+        return None
+
+    episode_counts = [parse_episode_count(candidate) for candidate in candidates]
+    matches = [
+        i for i, candidate in enumerate(candidates)
+        if episode_counts[i] == mal_episodes
+        and not _looks_like_extra(candidate, mal_info.anime_type)
+    ]
+    if len(matches) != 1:
+        return None
+
+    return {
+        "index": matches[0] + 1,
+        "confidence": "high",
+        "reason": "Unique episode-count match",
+        "mal_episodes": mal_episodes,
+        "selected_episodes": mal_episodes,
+        "episode_match": "exact"
+    }
+
+
+# Only lists this short are scored locally, and the best score must beat the
+# runner-up by more than this margin
+_SIMILARITY_MAX_CANDIDATES = 3
+_SIMILARITY_MARGIN = 0.3
+
+
+def _title_tokens(title: str) -> frozenset:
+    return frozenset(_EPS_RE.sub(" ", title).lower().translate(_SPLIT_TRANS).split())
+
+
+def _score(mal_tokens: frozenset, candidate: str, mal_info: MalInfo) -> float:
+    """Score a candidate by title Jaccard similarity, episode match and extras."""
+    candidate_tokens = _title_tokens(candidate)
+    jaccard = len(mal_tokens & candidate_tokens) / max(1, len(mal_tokens | candidate_tokens))
+    mal_episodes = mal_info.episodes
+    eps_bonus = 0.3 if mal_episodes is not None and parse_episode_count(candidate) == mal_episodes else 0.0
+    penalty = -0.5 if _looks_like_extra(candidate, mal_info.anime_type) else 0.0
+    return jaccard + eps_bonus + penalty
+
+
+def _try_similarity_match(mal_info: MalInfo, candidates: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Pick a candidate from a short list by title similarity.
+
+    Returns a selection (before episode validation) only if the best-scoring
+    candidate clearly beats the rest AND is the sole candidate whose episode
+    count matches MAL. A margin from title overlap alone (e.g. between
+    seasons of one series with equal episode counts) is left to Claude.
+    """
+    if mal_info.episodes is None or not 1 < len(candidates) <= _SIMILARITY_MAX_CANDIDATES:
+        return None
+
+    mal_tokens = _title_tokens(mal_info.title)
+    scores = [_score(mal_tokens, candidate, mal_info) for candidate in candidates]
+    ranked = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+    if scores[ranked[0]] - scores[ranked[1]] <= _SIMILARITY_MARGIN:
+        return None
+
+    best = ranked[0]
+    episode_matches = [
+        i for i, candidate in enumerate(candidates)
+        if parse_episode_count(candidate) == mal_info.episodes
+    ]
+    if episode_matches != [best]:
+        return None
+
+    return {
+        "index": best + 1,
+        "confidence": "high",
+        "reason": "Title similarity and episode count favor this candidate"
+    }
 
 
 def validate_episode_match(mal_episodes: Optional[int], selected_episodes: Optional[int]) -> Tuple[str, Optional[str]]:
@@ -58,51 +300,355 @@ def validate_episode_match(mal_episodes: Optional[int], selected_episodes: Optio
         return ("mismatch", "low")
 
 
-def create_selection_prompt(mal_info: Dict[str, Any], candidates: List[str]) -> str:
-    """Create the prompt for Claude to select the best anime match."""
+# Static prompt sections, built once at import instead of on every call
+_PROMPT_HEADER = (
+    "You are an anime title matching expert. Your task is to select the BEST "
+    "matching anime from a list of search results.\n\n"
+)
 
-    # Format candidates list
-    candidates_text = "\n".join(
-        f"{i+1}. {candidate}"
-        for i, candidate in enumerate(candidates)
-    )
-
-    prompt = f"""You are an anime title matching expert. Your task is to select the BEST matching anime from a list of search results.
-
-MAL (MyAnimeList) Information:
-- Title: "{mal_info['title']}"
-- Episodes: {mal_info.get('episodes', 'Unknown')}
-- Year: {mal_info.get('year', 'Unknown')}
-- Type: {mal_info.get('anime_type', 'Unknown')}
+_BATCH_PROMPT_HEADER = (
+    "You are an anime title matching expert. For EACH entry below, select the "
+    "BEST matching anime from its list of search results.\n\n"
+)
 
-Available Candidates from ani-cli search:
-{candidates_text}
+_MAL_INFO_TMPL = """- Title: "%s"
+- Episodes: %s
+- Year: %s
+- Type: %s
+"""
 
-Selection Criteria (in order of importance):
+_PROMPT_CRITERIA = """Selection Criteria (in order of importance):
 1. **Main series vs Specials/OVA**: Strongly prefer the main TV series over specials, recaps, or OVAs
 2. **Episode count**: The candidate should have a similar number of episodes to the MAL data
 3. **Series vs Season**: If the anime has multiple seasons, match the correct season
 4. **Title similarity**: Consider romanization variants and alternative titles
 5. **Year**: Should be close to the MAL year (within 1-2 years is acceptable)
 
-IMPORTANT NOTES:
-- "Specials", "Recap", "OVA", "ONA" usually indicate extra content, NOT the main series
-- If episode count differs significantly (>3 episodes), it's likely the wrong match
-- Be cautious with very short titles that might match multiple series
-- If no good match exists, select the closest one but mark confidence as "low"
+"""
+
+_PROMPT_NOTES = """If no good match exists, select the closest one but mark confidence as "low".
+
+"""
 
-Respond with ONLY valid JSON (no markdown, no explanation outside JSON):
-{{
-  "index": <number from 1 to {len(candidates)}>,
+_PROMPT_FOOTER_TMPL = """Respond with ONLY valid JSON (no markdown, no explanation outside JSON):
+{
+  "index": <number from 1 to %d>,
   "confidence": "high|medium|low",
   "reason": "<brief 1-sentence explanation of why this match was selected>"
-}}"""
+}"""
+
+_BATCH_PROMPT_NOTES = """If no good match exists for an entry, select the closest one but mark confidence as "low".
+
+"""
+
+_BATCH_PROMPT_FOOTER_TMPL = """Respond with ONLY a valid JSON array (no markdown, no explanation outside JSON) containing exactly %d objects, one per entry, in entry order:
+[
+  {
+    "index": <candidate number within that entry>,
+    "confidence": "high|medium|low",
+    "reason": "<brief 1-sentence explanation of why this match was selected>"
+  }
+]"""
+
+
+# A selection reply ({index, confidence, one-sentence reason}) fits well
+# within this budget; batch requests get this much per entry
+_SELECTION_MAX_TOKENS = 120
+# Stop decoding at the first blank line after the JSON object. "```" is not
+# used as a stop sequence because it would end a fenced reply before the JSON.
+_SELECTION_STOP_SEQUENCES = ["\n\n"]
+
+
+def _format_mal_info(mal_info: MalInfo) -> str:
+    return _MAL_INFO_TMPL % (
+        mal_info.title,
+        "Unknown" if mal_info.episodes is None else mal_info.episodes,
+        "Unknown" if mal_info.year is None else mal_info.year,
+        "Unknown" if mal_info.anime_type is None else mal_info.anime_type,
+    )
+
+
+def create_selection_prompt(mal_info: MalInfo, candidates: List[str]) -> str:
+    """Create the prompt for Claude to select the best anime match."""
 
-    return prompt
+    # Format candidates list
+    candidates_text = "\n".join([
+        f"{i+1}. {candidate}"
+        for i, candidate in enumerate(candidates)
+    ])
+
+    return "".join([
+        _PROMPT_HEADER,
+        "MAL (MyAnimeList) Information:\n",
+        _format_mal_info(mal_info),
+        "\nAvailable Candidates from ani-cli search:\n",
+        candidates_text,
+        "\n\n",
+        _PROMPT_CRITERIA,
+        _PROMPT_NOTES,
+        _PROMPT_FOOTER_TMPL % len(candidates),
+    ])
+
+
+def create_batch_selection_prompt(entries: List[Tuple[MalInfo, List[str]]]) -> str:
+    """Create one prompt asking Claude to select matches for several anime."""
+
+    parts = [_BATCH_PROMPT_HEADER]
+    for n, (mal_info, candidates) in enumerate(entries, start=1):
+        parts.append(f"Entry {n}:\n")
+        parts.append(_format_mal_info(mal_info))
+        parts.append("- Candidates:\n")
+        parts.append("\n".join([
+            f"   {i+1}. {candidate}"
+            for i, candidate in enumerate(candidates)
+        ]))
+        parts.append("\n\n")
+
+    parts.append(_PROMPT_CRITERIA)
+    parts.append(_BATCH_PROMPT_NOTES)
+    parts.append(_BATCH_PROMPT_FOOTER_TMPL % len(entries))
+    return "".join(parts)
+
+
+# Fixed result payloads. Results may be mutated or cached by callers, so
+# always hand out a shallow copy: dict(_SINGLE_CANDIDATE)
+_ERR_NO_CANDIDATES = {
+    "error": "No candidates provided",
+    "index": 0,
+    "confidence": "error"
+}
+
+_ERR_NO_API_KEY = {
+    "error": "ANTHROPIC_API_KEY not set in environment",
+    "index": 0,
+    "confidence": "error"
+}
+
+_ERR_NO_ANTHROPIC = {
+    "error": "anthropic package not installed. Run: pip install anthropic",
+    "index": 0,
+    "confidence": "error"
+}
+
+_ERR_MALFORMED_RESPONSE = {
+    "error": "Invalid response format from Claude",
+    "index": 1,  # Fallback to first candidate
+    "confidence": "low",
+    "reason": "API response was malformed"
+}
+
+_SINGLE_CANDIDATE = {
+    "index": 1,
+    "confidence": "high",
+    "reason": "Only one candidate available"
+}
+
+
+def _resolve_without_api(mal_info: MalInfo, candidates: List[str]) -> Optional[Dict[str, Any]]:
+    """Return a selection that needs no API call, or None if Claude must decide."""
+
+    if not candidates:
+        return dict(_ERR_NO_CANDIDATES)
+
+    # If only one candidate, return it directly
+    if len(candidates) == 1:
+        return dict(_SINGLE_CANDIDATE)
+
+    # Check the on-disk cache before touching the API
+    if _cache_enabled():
+        cached = _cache_get(_cache_key(mal_info, candidates))
+        if cached is not None:
+            return cached
+
+    # Skip the API call when only one main-series candidate remains
+    shown = _main_series_candidates(mal_info, candidates)
+    if len(shown) == 1:
+        return _finalize_selection({
+            "index": shown[0] + 1,
+            "confidence": "high",
+            "reason": "Only one main-series candidate available"
+        }, mal_info, candidates)
+
+    # Skip the API call when one candidate clearly matches
+    local_result = _try_local_match(mal_info, candidates)
+    if local_result is not None:
+        return local_result
+
+    # Skip the API call when a short list has a clear title-similarity winner
+    # that is also the only episode-count match
+    similarity_result = _try_similarity_match(mal_info, candidates)
+    if similarity_result is not None:
+        return _finalize_selection(similarity_result, mal_info, candidates)
+
+    return None
+
+
+def _resolve_api_key(api_key: Optional[str]) -> Optional[str]:
+    if api_key is None:
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+    return api_key or None
+
+
+def _is_selection(value: Any) -> bool:
+    return isinstance(value, dict) and "index" in value
+
+
+def _is_reply_shape(value: Any, expect_array: bool) -> bool:
+    """Return True for a selection object, or a non-empty array of them."""
+    if expect_array:
+        return isinstance(value, list) and bool(value) and all(_is_selection(v) for v in value)
+    return _is_selection(value)
+
+
+def _parse_reply(text: str, expect_array: bool) -> Any:
+    """
+    Decode the JSON object (or batch array of objects) in a reply.
+
+    Raises:
+        ValueError: If no JSON value of the expected shape is found
+    """
+    # Pull the JSON out of any markdown fence or surrounding prose
+    extract_re = _JSON_ARRAY_EXTRACT_RE if expect_array else _JSON_EXTRACT_RE
+    match = extract_re.search(text)
+    if match:
+        try:
+            value = _loads(match.group(0))
+            if _is_reply_shape(value, expect_array):
+                return value
+        except ValueError:
+            pass
+
+    # A brace or bracket inside a string defeats the regex, and prose may
+    # contain stray brackets; fall back to decoding from each opening
+    # character in turn. A value of the wrong shape is skipped as a whole so
+    # objects nested inside it are never taken as the reply.
+    opener = "[" if expect_array else "{"
+    decoder = json.JSONDecoder()
+    start = text.find(opener)
+    while start != -1:
+        try:
+            value, end = decoder.raw_decode(text, start)
+        except ValueError:
+            end = start + 1
+        else:
+            if _is_reply_shape(value, expect_array):
+                return value
+        start = text.find(opener, end)
+    raise ValueError("no JSON value found in reply")
+
+
+def _request_completion(
+    api_key: str,
+    prompt: str,
+    max_tokens: int,
+    stop_sequences: Optional[List[str]] = None,
+    expect_array: bool = False
+) -> Any:
+    """
+    Stream a prompt to Claude Haiku and return the decoded JSON reply.
+
+    Whenever a chunk contains the expected closing character ("}" for a
+    single selection object, "]" for a batch array), the text so far is
+    parsed; streaming stops once it decodes, so any trailing text the model
+    would generate is never waited for. A closing character inside a string
+    (e.g. a reason mentioning "[TV]") just fails to parse and streaming
+    continues.
+
+    Raises:
+        ValueError: If the complete reply contains no decodable JSON value
+    """
+    client = _get_client(api_key)
+    end_marker = "]" if expect_array else "}"
+
+    request = {
+        "model": _SELECTION_MODEL,
+        "max_tokens": max_tokens,
+        "temperature": 0.0,  # Deterministic selection
+        "messages": [{
+            "role": "user",
+            "content": prompt
+        }]
+    }
+    if stop_sequences:
+        request["stop_sequences"] = stop_sequences
+
+    chunks = []
+    with client.messages.stream(**request) as stream:
+        for text in stream.text_stream:
+            chunks.append(text)
+            if end_marker in text:
+                try:
+                    return _parse_reply("".join(chunks), expect_array)
+                except ValueError:
+                    continue
+
+    return _parse_reply("".join(chunks), expect_array)
+
+
+def _finalize_selection(
+    result: Any,
+    mal_info: MalInfo,
+    candidates: List[str],
+    shown: Optional[List[int]] = None
+) -> Dict[str, Any]:
+    """
+    Validate a selection returned by Claude and attach episode match info.
+
+    If shown is given, Claude only saw candidates[j] for j in shown, so the
+    reply's index is relative to that list and is mapped back to candidates;
+    fallbacks then pick the first shown candidate rather than one that was
+    filtered out.
+    """
+    if shown is None:
+        shown = list(range(len(candidates)))
+
+    # Validate response
+    if not isinstance(result, dict) or "index" not in result or "confidence" not in result:
+        malformed = dict(_ERR_MALFORMED_RESPONSE)
+        malformed["index"] = shown[0] + 1
+        return malformed
+
+    # Validate index is in valid range
+    index = result["index"]
+    index_valid = (
+        isinstance(index, int) and not isinstance(index, bool)
+        and 1 <= index <= len(shown)
+    )
+    if index_valid:
+        result["index"] = shown[index - 1] + 1
+    else:
+        result["index"] = shown[0] + 1
+        result["confidence"] = "low"
+        result["reason"] = f"Invalid index {index}, using first candidate"
+
+    # Validate episode count match
+    selected_title = candidates[result["index"] - 1]
+    selected_episodes = parse_episode_count(selected_title)
+    mal_episodes = mal_info.episodes
+
+    episode_match, confidence_adjustment = validate_episode_match(mal_episodes, selected_episodes)
+
+    # Adjust confidence if episode mismatch
+    if confidence_adjustment:
+        if result["confidence"] == "high":
+            result["confidence"] = "medium"
+        elif result["confidence"] == "medium":
+            result["confidence"] = "low"
+
+    # Add episode validation info to result
+    result["mal_episodes"] = mal_episodes
+    result["selected_episodes"] = selected_episodes
+    result["episode_match"] = episode_match
+
+    # Never persist a fallback for a bad reply; a later run may get a valid one
+    if index_valid and _cache_enabled():
+        _cache_put(_cache_key(mal_info, candidates), result)
+
+    return result
 
 
 def select_anime_with_claude(
-    mal_info: Dict[str, Any],
+    mal_info: MalInfo,
     candidates: List[str],
     api_key: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -110,157 +656,207 @@ def select_anime_with_claude(
     Use Claude Haiku to select the best matching anime.
 
     Args:
-        mal_info: Dictionary containing MAL metadata (title, episodes, year, type)
+        mal_info: MAL metadata (title, episodes, year, anime_type)
         candidates: List of anime titles from ani-cli search results
         api_key: Anthropic API key (if None, uses ANTHROPIC_API_KEY env var)
 
     Returns:
         Dictionary with keys: index (1-based), confidence, reason
     """
+    return select_anime_batch([(mal_info, candidates)], api_key)[0]
 
-    if not candidates:
-        return {
-            "error": "No candidates provided",
-            "index": 0,
-            "confidence": "error"
-        }
 
-    # If only one candidate, return it directly
-    if len(candidates) == 1:
-        return {
-            "index": 1,
-            "confidence": "high",
-            "reason": "Only one candidate available"
-        }
+def select_anime_batch(
+    entries: List[Tuple[MalInfo, List[str]]],
+    api_key: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Use Claude Haiku to select the best matching anime for several entries.
 
-    # Get API key
-    if api_key is None:
-        api_key = os.getenv("ANTHROPIC_API_KEY")
+    Entries that can be resolved locally (single candidate, cache hit, unique
+    episode-count match) never reach the API; all remaining entries are sent
+    to Claude in a single request.
+
+    Args:
+        entries: List of (mal_info, candidates) pairs, as for select_anime_with_claude
+        api_key: Anthropic API key (if None, uses ANTHROPIC_API_KEY env var)
 
+    Returns:
+        List of selection results, one per entry, in entry order
+    """
+
+    results: List[Optional[Dict[str, Any]]] = [
+        _resolve_without_api(mal_info, candidates)
+        for mal_info, candidates in entries
+    ]
+    pending = [i for i, result in enumerate(results) if result is None]
+    if not pending:
+        return results
+
+    api_key = _resolve_api_key(api_key)
     if not api_key:
-        return {
-            "error": "ANTHROPIC_API_KEY not set in environment",
-            "index": 0,
-            "confidence": "error"
-        }
+        for i in pending:
+            results[i] = dict(_ERR_NO_API_KEY)
+        return results
+
+    # Only show Claude the main-series candidates; _finalize_selection maps
+    # the reply's index back to the full candidate list
+    shown = [_main_series_candidates(*entries[i]) for i in pending]
+    prompt_entries = [
+        (entries[i][0], [entries[i][1][j] for j in indices])
+        for i, indices in zip(pending, shown)
+    ]
 
     try:
-        client = anthropic.Anthropic(api_key=api_key)
-
-        prompt = create_selection_prompt(mal_info, candidates)
-
-        message = client.messages.create(
-            model="claude-3-5-haiku-20241022",
-            max_tokens=300,
-            temperature=0.0,  # Deterministic selection
-            messages=[{
-                "role": "user",
-                "content": prompt
-            }]
-        )
+        if len(pending) == 1:
+            prompt = create_selection_prompt(*prompt_entries[0])
+            selections = [_request_completion(
+                api_key, prompt, _SELECTION_MAX_TOKENS, _SELECTION_STOP_SEQUENCES
+            )]
+        else:
+            prompt = create_batch_selection_prompt(prompt_entries)
+            selections = _request_completion(
+                api_key, prompt, _SELECTION_MAX_TOKENS * len(pending), expect_array=True
+            )
+
+        for n, i in enumerate(pending):
+            mal_info, candidates = entries[i]
+            selection = selections[n] if n < len(selections) else None
+            results[i] = _finalize_selection(selection, mal_info, candidates, shown[n])
+
+    except ImportError:
+        for i in pending:
+            results[i] = dict(_ERR_NO_ANTHROPIC)
+    except (json.JSONDecodeError, ValueError) as e:
+        for i in pending:
+            results[i] = {
+                "error": f"Failed to parse Claude response: {e}",
+                "index": 1,
+                "confidence": "low",
+                "reason": "JSON parsing error"
+            }
+    except Exception as e:
+        for i in pending:
+            results[i] = {
+                "error": f"API call failed: {e}",
+                "index": 1,
+                "confidence": "low",
+                "reason": f"Exception: {type(e).__name__}"
+            }
 
-        # Extract JSON from response
-        response_text = message.content[0].text.strip()
+    return results
 
-        # Remove markdown code blocks if present
-        if response_text.startswith("```"):
-            lines = response_text.split("\n")
-            response_text = "\n".join(lines[1:-1])
-        if response_text.startswith("json"):
-            response_text = response_text[4:].strip()
 
-        result = json.loads(response_text)
+def _is_str_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
 
-        # Validate response
-        if "index" not in result or "confidence" not in result:
-            return {
-                "error": "Invalid response format from Claude",
-                "index": 1,  # Fallback to first candidate
-                "confidence": "low",
-                "reason": "API response was malformed"
-            }
 
-        # Validate index is in valid range
-        index = result["index"]
-        if not isinstance(index, int) or index < 1 or index > len(candidates):
-            result["index"] = 1
-            result["confidence"] = "low"
-            result["reason"] = f"Invalid index {index}, using first candidate"
-
-        # Validate episode count match
-        selected_title = candidates[index - 1]
-        selected_episodes = parse_episode_count(selected_title)
-        mal_episodes = mal_info.get('episodes')
-
-        episode_match, confidence_adjustment = validate_episode_match(mal_episodes, selected_episodes)
-
-        # Adjust confidence if episode mismatch
-        if confidence_adjustment:
-            if result["confidence"] == "high":
-                result["confidence"] = "medium"
-            elif result["confidence"] == "medium":
-                result["confidence"] = "low"
-
-        # Add episode validation info to result
-        result["mal_episodes"] = mal_episodes
-        result["selected_episodes"] = selected_episodes
-        result["episode_match"] = episode_match
-
-        return result
-
-    except json.JSONDecodeError as e:
-        return {
-            "error": f"Failed to parse Claude response: {e}",
-            "index": 1,
-            "confidence": "low",
-            "reason": "JSON parsing error"
-        }
-    except Exception as e:
-        return {
-            "error": f"API call failed: {e}",
-            "index": 1,
-            "confidence": "low",
-            "reason": f"Exception: {type(e).__name__}"
-        }
+def _load_batch_file(path: str) -> List[Tuple[MalInfo, List[str]]]:
+    """
+    Load batch entries from a JSON file.
+
+    The file holds an array of objects with keys: title, episodes, year,
+    anime_type, candidates. Only title and candidates are required.
+
+    Raises:
+        ValueError: If the file is not valid JSON or does not have that shape
+    """
+    with open(path, "rb") as f:
+        data = _loads(f.read())
+
+    if not isinstance(data, list):
+        raise ValueError("batch file must contain a JSON array")
+
+    entries = []
+    for item in data:
+        if not isinstance(item, dict):
+            raise ValueError("batch entries must be objects")
+        if not isinstance(item.get("title"), str):
+            raise ValueError("batch entry title must be a string")
+        candidates = item.get("candidates")
+        if not _is_str_list(candidates):
+            raise ValueError("batch entry candidates must be an array of strings")
+        for key in ("episodes", "year"):
+            value = item.get(key)
+            # bool is an int subclass, but true/false is not a count or year
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+                raise ValueError(f"batch entry {key} must be an integer or null")
+        if item.get("anime_type") is not None and not isinstance(item["anime_type"], str):
+            raise ValueError("batch entry anime_type must be a string or null")
+
+        mal_info = MalInfo(
+            item["title"],
+            item.get("episodes"),
+            item.get("year"),
+            item.get("anime_type")
+        )
+        entries.append((mal_info, candidates))
+    return entries
+
+
+# Returned by _candidates_arg for bad input, so main can report it as error
+# JSON instead of letting argparse exit with a usage message
+_INVALID_JSON = object()
+
+
+def _candidates_arg(value: str) -> Any:
+    """argparse type that decodes --candidates as a JSON array of strings."""
+    try:
+        candidates = _loads(value)
+    except ValueError:
+        return _INVALID_JSON
+    return candidates if _is_str_list(candidates) else _INVALID_JSON
 
 
 def main():
     parser = argparse.ArgumentParser(
         description="Select best anime match using Claude Haiku"
     )
-    parser.add_argument("--mal-title", required=True, help="Anime title from MAL")
+    parser.add_argument("--mal-title", help="Anime title from MAL")
     parser.add_argument("--episodes", type=int, help="Number of episodes from MAL")
     parser.add_argument("--year", type=int, help="Year from MAL")
     parser.add_argument("--anime-type", help="Anime type from MAL (TV, Movie, etc)")
-    parser.add_argument("--candidates", required=True, help="JSON array of candidate titles")
+    parser.add_argument("--candidates", type=_candidates_arg, help="JSON array of candidate titles")
+    parser.add_argument("--batch-file", help="JSON file with an array of entries to select in one API call")
     parser.add_argument("--api-key", help="Anthropic API key (optional, uses env var if not provided)")
 
     args = parser.parse_args()
 
-    # Parse candidates JSON
-    try:
-        candidates = json.loads(args.candidates)
-    except json.JSONDecodeError:
-        print(json.dumps({
+    if args.batch_file:
+        try:
+            entries = _load_batch_file(args.batch_file)
+        except (OSError, ValueError):
+            _write_json({
+                "error": "Invalid batch file",
+                "index": 0,
+                "confidence": "error"
+            })
+            sys.exit(1)
+
+        results = select_anime_batch(entries, args.api_key)
+        _write_json(results)
+        sys.exit(1 if any("error" in r for r in results) else 0)
+
+    if args.mal_title is None or args.candidates is None:
+        parser.error("--mal-title and --candidates are required without --batch-file")
+
+    if args.candidates is _INVALID_JSON:
+        _write_json({
             "error": "Invalid JSON in candidates argument",
             "index": 0,
             "confidence": "error"
-        }))
+        })
         sys.exit(1)
 
-    # Build MAL info dictionary
-    mal_info = {
-        "title": args.mal_title,
-        "episodes": args.episodes,
-        "year": args.year,
-        "anime_type": args.anime_type
-    }
+    candidates = args.candidates
+
+    mal_info = MalInfo(args.mal_title, args.episodes, args.year, args.anime_type)
 
     # Call Claude for selection
     result = select_anime_with_claude(mal_info, candidates, args.api_key)
 
     # Output result as JSON
-    print(json.dumps(result, ensure_ascii=False))
+    _write_json(result)
 
     # Exit with error code if selection failed
     if "error" in result: